@@ -1,18 +1,108 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import String, case, func, inspect, make_url, select, text, type_coerce, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./team_matching.db"
+# 기본은 로컬 SQLite, 운영 환경에서는 DATABASE_URL로 지정 (예: postgresql+asyncpg://user:pw@host/db)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./team_matching.db")
+IS_SQLITE = make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# 충돌 무시 INSERT(ON CONFLICT DO NOTHING)는 방언별 insert로 구성
+if IS_SQLITE:
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+else:
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+# 동시 요청이 많을 때 기본 풀(5+10)이 고갈되지 않도록 풀 크기를 늘림 (환경변수로 조정 가능)
+# pool_pre_ping: 커넥션 체크아웃마다 SELECT 1 한 번이 추가되지만 끊어진 커넥션으로 인한 지연/오류를 방지
+# 엔진은 프로세스당 하나만 만들고 모든 세션이 이 풀의 커넥션을 재사용
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    pool_size=int(os.getenv("DB_POOL_SIZE", "25")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "25")),
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    query_cache_size=1200, # 컴파일된 SQL 캐시 크기 (기본 500)
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# AsyncSession은 커밋 후 속성 접근 시 암묵적 재조회(I/O)를 할 수 없으므로 expire_on_commit=False
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+# 테이블 생성 (import 시점이 아닌 시작 단계/배포 단계에서 한 번만 실행)
+# create_all은 없는 테이블만 만들고 기존 테이블에는 컬럼/인덱스를 추가하지 않음 → 기존 DB는 migrate_db 사용
+async def init_db():
+    import models  # 모델을 Base.metadata에 등록
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# 기존 테이블에 모델에는 있지만 DB에는 없는 컬럼을 ALTER TABLE ... ADD COLUMN으로 추가
+def _add_missing_columns(sync_conn):
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = sync_conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_ddl = CreateColumn(column).compile(dialect=sync_conn.dialect)
+                sync_conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}"))
+
+# 기존 테이블에 없는 인덱스 생성 (create_all은 이미 있는 테이블의 인덱스를 만들지 않음)
+def _create_missing_indexes(sync_conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+# users.mbti가 문자열 컬럼인 기존 DB는 "INTJ" 같은 값을 정수 코드(MBTI_TYPES의 인덱스)로 변환
+def _convert_mbti_codes(sync_conn):
+    import models
+    mbti_column = next(c for c in inspect(sync_conn).get_columns("users") if c["name"] == "mbti")
+    if not isinstance(mbti_column["type"], String):
+        return
+    users = models.User.__table__
+    # MbtiType의 바인드 변환을 거치지 않도록 저장된 값을 문자열로 비교
+    mbti = func.upper(type_coerce(users.c.mbti, String))
+    sync_conn.execute(
+        update(users)
+        .where(mbti.in_(models.MBTI_TYPES))
+        .values(mbti=case({name: code for code, name in enumerate(models.MBTI_TYPES)}, value=mbti))
+    )
+
+# 기존 DB를 현재 모델에 맞추는 일회성 마이그레이션 (배포 시 워커 시작 전에 한 번 실행, 여러 번 실행해도 결과 동일)
+# `python -c "import asyncio, database; asyncio.run(database.migrate_db())"`
+# bind: 마이그레이션할 엔진 (기본은 DATABASE_URL의 엔진)
+async def migrate_db(bind=None):
+    import models  # 모델을 Base.metadata에 등록
+    async with (bind or engine).begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+        await conn.run_sync(_convert_mbti_codes)
+        # DB 기본값 없이 생성된 기존 컬럼에 남은 NULL을 기본값으로 채움 (NULL이면 대기/미확정 조건에 걸리지 않음)
+        await conn.execute(update(models.Team).where(models.Team.completed.is_(None)).values(completed=False))
+        await conn.execute(update(models.Application).where(models.Application.status.is_(None)).values(status=0))
+        # 기존 관리자 계정의 is_admin 플래그 반영
+        await conn.execute(
+            update(models.User).where(models.User.student_id == models.ADMIN_STUDENT_ID).values(is_admin=True)
+        )
+        # 캐시된 팀원 수/팀 수를 실제 행 수로 다시 맞춤 (teams/competitions 전체를 다시 쓰므로 워커 시작 전, 트래픽이 없을 때만 실행)
+        Team, Member, Competition = models.Team, models.Member, models.Competition
+        await conn.execute(update(Team).values(
+            member_count=select(func.count()).select_from(Member).where(Member.tid == Team.tid).scalar_subquery()
+        ))
+        await conn.execute(update(Competition).values(
+            team_count=select(func.count()).select_from(Team).where(Team.pid == Competition.pid).scalar_subquery()
+        ))
+
+# INIT_DB=0 이면 워커 시작 시 스키마 생성을 건너뜀
+# (배포 시 `python -c "import asyncio, database; asyncio.run(database.migrate_db())"`로 한 번만 실행)
+INIT_DB = os.getenv("INIT_DB", "1") != "0"
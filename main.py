@@ -1,15 +1,32 @@
-from fastapi import FastAPI, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database import Base, engine, get_db
-from models import User, Competition, Participation, Team, Member, Application
-from schemas import UserCreate, UserLogin, CompetitionCreate, CompetitionOut
-from passlib.context import CryptContext
+from fastapi import FastAPI, Depends, HTTPException, Response, status
+from sqlalchemy.orm import aliased, joinedload, load_only, raiseload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from database import INIT_DB, dialect_insert, get_db, init_db
+from models import (
+    ADMIN_STUDENT_ID, User, Competition, Participation, Team, Member, Application,
+    SELECT_COMPETITION_BY_ID, SELECT_COMPETITION_MATCH_START, SELECT_MEMBER_BY_ID, SELECT_PARTICIPATION_BY_ID, SELECT_PENDING_APPLICATION,
+    SELECT_TEAM_BY_ID, SELECT_USER_BY_ID, SELECT_USER_CREDENTIALS, SELECT_USER_PROFILE,
+)
+from schemas import COMPETITIONS_ADAPTER, to_out, UserCreate, UserLogin, CompetitionCreate, CompetitionOut
+from security import get_password_hash, verify_and_update_password, warm_up_password_hashing
 from typing import List
+from contextlib import asynccontextmanager
 from datetime import date
+from cachetools import TTLCache
+import orjson
 from fastapi.middleware.cors import CORSMiddleware # CORS 임포트
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if INIT_DB:
+        await init_db() # DB 테이블 생성
+    # argon2/bcrypt 해시 백엔드 로딩을 미리 수행해 첫 /login(기존 bcrypt 해시 포함) 요청 지연 방지
+    await warm_up_password_hashing()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 미들웨어 설정
 origins = [
@@ -25,25 +42,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Base.metadata.create_all(bind=engine) # DB 테이블 생성
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+# 대회 목록 캐시 (조회는 많고 변경은 드묾) - 대회 생성/수정/삭제 시 무효화
+# 모든 라우트가 이벤트 루프에서 실행되므로 별도 락 없이 접근
+_comp_cache = TTLCache(maxsize=1, ttl=30)
+# 무효화할 때마다 증가 - 조회 중(await) 무효화가 일어났다면 오래된 결과를 캐시에 다시 넣지 않기 위해 사용
+_comp_cache_generation = 0
+
+def invalidate_competition_cache():
+    global _comp_cache_generation
+    _comp_cache_generation += 1
+    _comp_cache.clear()
+
+# 읽기 전용 목록 응답은 Pydantic 검증/변환 없이 orjson으로 바로 직렬화 (date도 orjson이 직접 처리)
+# response_model은 OpenAPI 문서용으로만 유지
+def json_response(content) -> Response:
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
+# 존재 여부만 필요할 때 ORM 객체를 만들지 않고 SELECT EXISTS(...)로 확인
+async def record_exists(db: AsyncSession, stmt, params=None) -> bool:
+    return await db.scalar(select(stmt.exists()), params)
+
+# 미리 구성한 조회 문장을 실행해 ORM 객체 하나(또는 None)를 반환
+async def fetch_one(db: AsyncSession, stmt, params):
+    return (await db.execute(stmt, params)).scalar_one_or_none()
+
+# 연결 테이블(참가/팀원/신청) 행을 INSERT 한 문장으로 일괄 추가 (행 수와 무관하게 왕복 1회)
+# 이미 있는 행(PK 충돌)은 건너뛰고 실제로 추가된 행 수를 반환
+# (여러 행 실행 시 rowcount를 보장하지 않는 드라이버(asyncpg)가 있어 RETURNING으로 추가된 행을 셈)
+async def bulk_insert_ignore(db: AsyncSession, model, rows: List[dict]) -> int:
+    if not rows: # 빈 목록이면 INSERT 문을 만들지 않음 (VALUES 없는 INSERT는 문법 오류)
+        return 0
+    table = model.__table__
+    stmt = dialect_insert(table).on_conflict_do_nothing().returning(*table.primary_key.columns)
+    return len((await db.execute(stmt, rows)).all())
+
+async def bulk_add_participations(db: AsyncSession, pid: int, student_ids: List[str]) -> int:
+    return await bulk_insert_ignore(db, Participation, [{"student_id": sid, "pid": pid} for sid in student_ids])
+
+# 실제로 추가된 인원만큼 teams.member_count도 같은 트랜잭션에서 갱신
+async def bulk_add_members(db: AsyncSession, tid: int, student_ids: List[str]) -> int:
+    added = await bulk_insert_ignore(db, Member, [{"tid": tid, "student_id": sid} for sid in student_ids])
+    if added:
+        await db.execute(update(Team).where(Team.tid == tid).values(member_count=Team.member_count + added))
+    return added
+
+async def bulk_add_applications(db: AsyncSession, tid: int, student_ids: List[str]) -> int:
+    # status는 컬럼 default(0: 대기)로 채워지므로 생략
+    return await bulk_insert_ignore(db, Application, [{"tid": tid, "student_id": sid} for sid in student_ids])
 
 @app.get("/")
 def read_root():
     return {"message": "TEAMGETHER FastAPI 백엔드"}
 
 @app.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.student_id == user.student_id).first():
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    if await record_exists(db, SELECT_USER_BY_ID, {"sid": user.student_id}):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 존재하는 학번입니다.")
-    hashed_pw = get_password_hash(user.password)
+    hashed_pw = await get_password_hash(user.password)
     db_user = User(
         student_id=user.student_id,
         password=hashed_pw,
@@ -53,169 +108,197 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         mbti=user.mbti,
         career=user.career,
         gender=user.gender,
-        intro=user.intro
+        intro=user.intro,
+        is_admin=user.student_id == ADMIN_STUDENT_ID
     )
     db.add(db_user)
-    db.commit()
+    await db.commit()
     return {"message": "회원가입 성공"}
 
 @app.post("/login")
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)): # 변수명 변경 UserLogin -> user_credentials
-    db_user = db.query(User).filter(User.student_id == user_credentials.student_id).first()
-    if not db_user or not verify_password(user_credentials.password, db_user.password):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)): # 변수명 변경 UserLogin -> user_credentials
+    db_user = (await db.execute(SELECT_USER_CREDENTIALS, {"sid": user_credentials.student_id})).mappings().first()
+    if not db_user:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 학번 또는 비밀번호입니다.")
+    verified, new_hash = await verify_and_update_password(user_credentials.password, db_user["password"])
+    if not verified:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 학번 또는 비밀번호입니다.")
-    # "11111111" 학번을 관리자로 간주 (요청사항 기반)
-    is_admin = user_credentials.student_id == "11111111"
+    if new_hash: # 기존 bcrypt 해시(또는 이전 비용 설정)는 로그인 성공 시 새 해시로 교체
+        await db.execute(update(User).where(User.student_id == db_user["student_id"]).values(password=new_hash))
+        await db.commit()
     # 로그인 시 사용자 전체 정보 반환하도록 수정 (프론트엔드에서 활용)
     return {
         "message": "로그인 성공",
         "user": {
-            "id": db_user.student_id, # 프론트엔드 호환성을 위해 id 필드 추가
-            "student_id": db_user.student_id,
-            "name": db_user.name,
-            "phone_number": db_user.phone_number,
-            "main_language": db_user.main_language,
-            "mbti": db_user.mbti,
-            "career": db_user.career,
-            "gender": db_user.gender,
-            "intro": db_user.intro,
-            "isAdmin": is_admin # 관리자 여부 플래그
+            "id": db_user["student_id"], # 프론트엔드 호환성을 위해 id 필드 추가
+            "student_id": db_user["student_id"],
+            "name": db_user["name"],
+            "phone_number": db_user["phone_number"],
+            "main_language": db_user["main_language"],
+            "mbti": db_user["mbti"],
+            "career": db_user["career"],
+            "gender": db_user["gender"],
+            "intro": db_user["intro"],
+            "isAdmin": db_user["is_admin"] # 관리자 여부 플래그
         }
     }
 
 
 @app.post("/competitions", response_model=CompetitionOut)
-def create_competition(comp: CompetitionCreate, db: Session = Depends(get_db)):
-    db_comp = Competition(**comp.dict())
+async def create_competition(comp: CompetitionCreate, db: AsyncSession = Depends(get_db)):
+    db_comp = Competition(**comp.model_dump())
     db.add(db_comp)
-    db.commit()
-    db.refresh(db_comp)
+    await db.commit() # expire_on_commit=False 이므로 refresh 없이 pid 포함 값 사용 가능
+    invalidate_competition_cache()
     return db_comp
 
 @app.delete("/competitions/{pid}")
-def delete_competition(pid: int, db: Session = Depends(get_db)):
-    comp = db.query(Competition).filter_by(pid=pid).first()
-    if not comp:
+async def delete_competition(pid: int, db: AsyncSession = Depends(get_db)):
+    # 관련된 참가, 팀, 팀원, 지원 정보를 테이블당 DELETE 한 번으로 삭제 (팀 수와 무관)
+    team_ids = select(Team.tid).where(Team.pid == pid)
+    await db.execute(delete(Member).where(Member.tid.in_(team_ids)))
+    await db.execute(delete(Application).where(Application.tid.in_(team_ids)))
+    await db.execute(delete(Team).where(Team.pid == pid))
+    await db.execute(delete(Participation).where(Participation.pid == pid))
+    result = await db.execute(delete(Competition).where(Competition.pid == pid))
+    if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 대회를 찾을 수 없습니다.")
-    # 관련된 참가, 팀, 지원 정보도 삭제하는 로직 추가 (선택적이지만 권장)
-    db.query(Participation).filter_by(pid=pid).delete()
-    # 팀 삭제 시 Member, Application도 연쇄적으로 삭제되도록 관계 설정 또는 직접 삭제 로직 필요
-    teams_to_delete = db.query(Team).filter_by(pid=pid).all()
-    for team in teams_to_delete:
-        db.query(Member).filter_by(tid=team.tid).delete()
-        db.query(Application).filter_by(tid=team.tid).delete()
-        db.delete(team)
-    db.delete(comp)
-    db.commit()
+    await db.commit()
+    invalidate_competition_cache()
     return {"message": "대회 삭제 완료"}
 
 @app.get("/competitions", response_model=List[CompetitionOut])
-def list_competitions(db: Session = Depends(get_db)):
-    return db.query(Competition).all()
+async def list_competitions(db: AsyncSession = Depends(get_db)):
+    body = _comp_cache.get("all")
+    if body is None:
+        generation = _comp_cache_generation
+        # ORM 객체를 만들지 않고 컬럼 값만 조회해 직렬화된 JSON 바이트로 캐시
+        rows = (await db.execute(select(Competition.__table__))).all()
+        body = COMPETITIONS_ADAPTER.dump_json([to_out(row) for row in rows]) # pydantic-core가 바로 JSON 바이트로 직렬화
+        if generation == _comp_cache_generation: # 조회 도중 대회가 변경되지 않은 경우에만 캐시에 저장
+            _comp_cache["all"] = body
+    return Response(content=body, media_type="application/json")
 
 # 대회 수정 API (추가)
 @app.put("/competitions/{pid}", response_model=CompetitionOut)
-def update_competition(pid: int, comp_update: CompetitionCreate, db: Session = Depends(get_db)):
-    db_comp = db.query(Competition).filter_by(pid=pid).first()
+async def update_competition(pid: int, comp_update: CompetitionCreate, db: AsyncSession = Depends(get_db)):
+    db_comp = await fetch_one(db, SELECT_COMPETITION_BY_ID, {"pid": pid})
     if not db_comp:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 대회를 찾을 수 없습니다.")
 
-    for key, value in comp_update.dict().items():
+    for key, value in comp_update.model_dump().items():
         setattr(db_comp, key, value)
 
-    db.commit()
-    db.refresh(db_comp)
+    await db.commit()
+    invalidate_competition_cache()
     return db_comp
 
 
 @app.post("/participate/{student_id}/{pid}")
-def participate(student_id: str, pid: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter_by(student_id=student_id).first()
-    if not user:
+async def participate(student_id: str, pid: int, db: AsyncSession = Depends(get_db)):
+    if not await record_exists(db, SELECT_USER_BY_ID, {"sid": student_id}):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
-    comp = db.query(Competition).filter_by(pid=pid).first()
+    comp = (await db.execute(SELECT_COMPETITION_MATCH_START, {"pid": pid})).first()
     if not comp:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="대회를 찾을 수 없습니다.")
     if date.today() > comp.match_start: # 매칭 시작일 이후에는 참가 신청 불가
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 매칭이 시작되어 참가 신청을 할 수 없습니다.")
-    if db.query(Participation).filter_by(student_id=student_id, pid=pid).first():
+    # 중복 여부는 PK(student_id, pid) 충돌로 판단 (조회 후 삽입 사이의 경쟁 조건 제거)
+    if await bulk_add_participations(db, pid, [student_id]) == 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 해당 대회에 참가 신청했습니다.")
-    db_participation = Participation(student_id=student_id, pid=pid)
-    db.add(db_participation)
-    db.commit()
+    await db.commit()
     return {"message": "대회 참가 신청 완료"}
 
 @app.delete("/participate/{student_id}/{pid}")
-def cancel_participation(student_id: str, pid: int, db: Session = Depends(get_db)):
-    part = db.query(Participation).filter_by(student_id=student_id, pid=pid).first()
+async def cancel_participation(student_id: str, pid: int, db: AsyncSession = Depends(get_db)):
+    part = await fetch_one(db, SELECT_PARTICIPATION_BY_ID, {"sid": student_id, "pid": pid})
     if not part:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="참가 신청 내역이 없습니다.")
-    comp = db.query(Competition).filter_by(pid=pid).first()
+    comp = (await db.execute(SELECT_COMPETITION_MATCH_START, {"pid": pid})).first()
     if not comp: # 혹시 모를 경우
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="대회 정보를 찾을 수 없습니다.")
     if date.today() >= comp.match_start: # 매칭 시작일 이후에는 참가 취소 불가
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="매칭이 시작되어 참가를 취소할 수 없습니다.")
-    db.delete(part)
-    db.commit()
+    await db.delete(part)
+    await db.commit()
     return {"message": "참가 신청 취소 완료"}
 
 # 내가 참가한 대회 목록 가져오기 (추가)
 @app.get("/participations/{student_id}", response_model=List[CompetitionOut])
-def get_my_participated_competitions(student_id: str, db: Session = Depends(get_db)):
-    participations = db.query(Participation).filter_by(student_id=student_id).all()
-    if not participations:
-        return []
-    competition_pids = [p.pid for p in participations]
-    competitions = db.query(Competition).filter(Competition.pid.in_(competition_pids)).all()
-    return competitions
+async def get_my_participated_competitions(student_id: str, db: AsyncSession = Depends(get_db)):
+    # 참가 내역 조회 후 IN 쿼리를 다시 보내지 않고 조인 한 번으로 조회
+    rows = (await db.execute(
+        select(Competition.__table__)
+        .join(Participation, Participation.pid == Competition.pid)
+        .where(Participation.student_id == student_id)
+    )).all()
+    return Response(content=COMPETITIONS_ADAPTER.dump_json([to_out(row) for row in rows]), media_type="application/json")
 
 
 @app.post("/team/create/{student_id}/{pid}")
-def create_team(student_id: str, pid: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter_by(student_id=student_id).first()
-    if not user:
+async def create_team(student_id: str, pid: int, db: AsyncSession = Depends(get_db)):
+    if not await record_exists(db, SELECT_USER_BY_ID, {"sid": student_id}):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
-    comp = db.query(Competition).filter_by(pid=pid).first()
-    if not comp:
+    # 대회 최소 인원, 참가 인원수, 팀 수(캐시 컬럼)를 한 번의 쿼리로 조회
+    stats = (await db.execute(
+        select(
+            Competition.min_members,
+            select(func.count()).select_from(Participation).where(Participation.pid == pid).scalar_subquery(),
+            Competition.team_count,
+        ).where(Competition.pid == pid)
+    )).first()
+    if not stats:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="대회를 찾을 수 없습니다.")
+    min_members, part_count, team_count = stats
 
     # 이미 해당 대회에 팀이 있는지 (팀장 또는 팀원) 확인
-    existing_member = db.query(Member).join(Team).filter(Team.pid == pid, Member.student_id == student_id).first()
-    if existing_member:
+    if await record_exists(db, select(Member).join(Team).where(Team.pid == pid, Member.student_id == student_id)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 이 대회의 다른 팀에 소속되어 있습니다.")
 
 
     # 팀 개설 조건: (프로젝트A 참가 인원수 / 프로젝트A 최소 인원수) < 프로젝트A 팀장 수 (즉, 팀 수가 부족할 때만 개설 가능)
     # 또는 요청사항: (참가인원수/최소인원수) 가 팀장수와 같거나 클 때 개설 불가
     # 여기서는 후자로 구현
-    part_count = db.query(Participation).filter_by(pid=pid).count()
-    team_count = db.query(Team).filter_by(pid=pid).count()
-    if comp.min_members > 0 : # 0으로 나누기 방지
-      if (part_count // comp.min_members <= team_count) and team_count > 0 : # 팀이 하나라도 있을 때 이 조건 적용
+    if min_members > 0 : # 0으로 나누기 방지
+      if (part_count // min_members <= team_count) and team_count > 0 : # 팀이 하나라도 있을 때 이 조건 적용
           raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="팀 개설 조건(참가 인원 대비 팀 수)을 만족하지 못합니다.")
 
 
-    team = Team(leader_id=student_id, pid=pid, completed=False)
+    team = Team(leader_id=student_id, pid=pid) # completed는 컬럼 default(False)
     db.add(team)
-    db.commit()
-    db.refresh(team) # team.tid를 얻기 위해 refresh
+    try:
+        await db.flush() # team.tid를 얻기 위해 flush (팀 + 팀장 멤버 추가를 한 트랜잭션으로 커밋)
+    except IntegrityError: # 같은 팀장의 동시 요청 - 유니크 인덱스(leader_id, pid) 충돌
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 이 대회의 다른 팀에 소속되어 있습니다.")
+    await db.execute(update(Competition).where(Competition.pid == pid).values(team_count=Competition.team_count + 1))
     # 팀 생성 시 팀장을 멤버로 자동 추가
-    db_member = Member(tid=team.tid, student_id=student_id)
-    db.add(db_member)
-    db.commit()
+    await bulk_add_members(db, team.tid, [student_id])
+    await db.commit()
     return {"message": "팀 생성 완료", "team_id": team.tid} # tid -> team_id로 변경 (일관성)
 
 # 특정 대회의 팀 목록 가져오기 (팀원 정보 포함 - 상세)
 @app.get("/teams/{pid}", response_model=List[dict]) # 스키마 정의가 복잡하므로 dict로 임시 처리
-def list_teams_for_competition(pid: int, db: Session = Depends(get_db)):
-    teams = db.query(Team).filter_by(pid=pid).all()
+async def list_teams_for_competition(pid: int, db: AsyncSession = Depends(get_db)):
+    # 팀장, 팀원(+사용자 정보)을 한 번에 로딩 (팀 수와 무관하게 쿼리 2~3개)
+    # raiseload("*"): 지정하지 않은 관계에 접근하면 N+1 지연 로딩 대신 예외 발생
+    # 사용자 정보는 응답에 쓰는 컬럼만 로딩
+    user_cols = load_only(User.student_id, User.name, User.gender, User.intro, User.phone_number)
+    teams = (await db.scalars(
+        select(Team)
+        .options(
+            joinedload(Team.leader).options(user_cols),
+            selectinload(Team.members).joinedload(Member.user).options(user_cols),
+            raiseload("*"),
+        )
+        .where(Team.pid == pid)
+    )).all()
     result = []
     for team_db in teams:
-        leader_user = db.query(User).filter_by(student_id=team_db.leader_id).first()
-        members_db = db.query(Member).filter_by(tid=team_db.tid).all()
+        leader_user = team_db.leader
         member_users_info = []
-        for member_entry in members_db:
-            user_info = db.query(User).filter_by(student_id=member_entry.student_id).first()
+        for member_entry in team_db.members:
+            user_info = member_entry.user
             if user_info:
                 member_users_info.append({
                     "id": user_info.student_id,
@@ -242,100 +325,114 @@ def list_teams_for_competition(pid: int, db: Session = Depends(get_db)):
             "members": member_users_info,
             "is_complete": team_db.completed
         })
-    return result
-
+    return json_response(result)
+
+
+# 팀 확정 여부, 대회 최대 인원, 현재 팀원 수, 해당 학생이 같은 대회에서 이미 소속된 팀,
+# 학생 존재 여부, 이 팀에 지원한 적이 있는지, 대기 중(status=0)인 신청이 있는지를 한 번의 쿼리로 조회
+async def get_team_join_status(db: AsyncSession, tid: int, student_id: str):
+    team_in_comp = aliased(Team)
+    return (await db.execute(
+        select(
+            Team.completed,
+            Competition.max_members,
+            Team.member_count,
+            select(Member.tid).join(team_in_comp, Member.tid == team_in_comp.tid)
+            .where(team_in_comp.pid == Team.pid, Member.student_id == student_id)
+            .limit(1).scalar_subquery().label("existing_tid"),
+            select(User.student_id).where(User.student_id == student_id).exists().label("user_exists"),
+            select(Application.tid).where(Application.tid == Team.tid, Application.student_id == student_id)
+            .exists().label("already_applied"),
+            select(Application.tid)
+            .where(Application.tid == Team.tid, Application.student_id == student_id, Application.status == 0)
+            .exists().label("pending_application"),
+        )
+        .join(Competition, Competition.pid == Team.pid)
+        .where(Team.tid == tid)
+    )).first()
 
 @app.post("/apply/{student_id}/{tid}")
-def apply_to_team(student_id: str, tid: int, db: Session = Depends(get_db)): # 함수명 변경
-    user = db.query(User).filter_by(student_id=student_id).first()
-    if not user:
+async def apply_to_team(student_id: str, tid: int, db: AsyncSession = Depends(get_db)): # 함수명 변경
+    if not await record_exists(db, SELECT_USER_BY_ID, {"sid": student_id}):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
-    team = db.query(Team).filter_by(tid=tid).first()
-    if not team:
+    team_status = await get_team_join_status(db, tid, student_id)
+    if not team_status:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="팀을 찾을 수 없습니다.")
-    if team.completed:
+    if team_status.completed:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 확정된 팀에는 지원할 수 없습니다.")
 
-    # 이미 해당 대회(team.pid)의 다른 팀에 멤버로 있는지 확인
-    existing_member = db.query(Member).join(Team).filter(Team.pid == team.pid, Member.student_id == student_id).first()
-    if existing_member:
+    # 이미 해당 대회의 다른 팀에 멤버로 있는지 확인
+    if team_status.existing_tid is not None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 이 대회의 다른 팀에 소속되어 있습니다. 지원할 수 없습니다.")
 
 
-    if db.query(Application).filter_by(student_id=student_id, tid=tid).first():
+    if team_status.already_applied:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 해당 팀에 지원했습니다.")
 
     # 팀 최대 인원수 체크
-    comp = db.query(Competition).filter_by(pid=team.pid).first()
-    current_members_count = db.query(Member).filter_by(tid=tid).count()
-    if current_members_count >= comp.max_members:
+    if team_status.member_count >= team_status.max_members:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="팀 인원이 이미 가득 찼습니다.")
 
 
-    db_application = Application(student_id=student_id, tid=tid, status=0) # 0: 대기
-    db.add(db_application)
-    db.commit()
+    # 위 확인과 삽입 사이에 동시 지원이 들어온 경우는 PK(tid, student_id) 충돌로 판단
+    if await bulk_add_applications(db, tid, [student_id]) == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 해당 팀에 지원했습니다.")
+    await db.commit()
     return {"message": "팀 지원 완료"}
 
 @app.get("/team/applications/{leader_id}", response_model=List[dict]) # 팀장이 자기 팀들의 지원자 목록 확인
-def get_applications_for_leader_teams(leader_id: str, db: Session = Depends(get_db)):
-    # 해당 리더가 팀장인 모든 팀을 조회
-    leader_teams = db.query(Team).filter_by(leader_id=leader_id, completed=False).all() # 미확정 팀만
-    if not leader_teams:
-        return []
+async def get_applications_for_leader_teams(leader_id: str, db: AsyncSession = Depends(get_db)):
+    # 해당 리더의 미확정 팀에 들어온 '대기 상태(0)' 신청서 + 지원자 정보를 한 번에 조회
+    rows = (await db.execute(
+        select(Team, Application, User)
+        .join(Application, Application.tid == Team.tid)
+        .join(User, User.student_id == Application.student_id)
+        .where(Team.leader_id == leader_id, Team.completed == False, Application.status == 0)
+        .options(raiseload("*"))
+    )).all()
 
     all_applications_info = []
-    for team in leader_teams:
-        # 해당 팀에 들어온 '대기 상태(0)' 신청서만 조회
-        applications_for_team = db.query(Application).filter_by(tid=team.tid, status=0).all()
-        for app in applications_for_team:
-            applicant_user = db.query(User).filter_by(student_id=app.student_id).first()
-            if applicant_user:
-                all_applications_info.append({
-                    "application_id": f"{app.tid}-{app.student_id}", # 프론트엔드에서 사용할 고유 ID
-                    "team_id": team.tid,
-                    "project_id": team.pid, # 어느 대회의 팀인지
-                    "status": app.status, # 항상 0 (대기)
-                    "applicant_info": { # 지원자 정보
-                        "id": applicant_user.student_id,
-                        "student_id": applicant_user.student_id,
-                        "name": applicant_user.name,
-                        "phone_number": applicant_user.phone_number,
-                        "main_language": applicant_user.main_language,
-                        "mbti": applicant_user.mbti,
-                        "career": applicant_user.career,
-                        "gender": applicant_user.gender,
-                        "intro": applicant_user.intro
-                    }
-                })
+    for team, app, applicant_user in rows:
+        all_applications_info.append({
+            "application_id": f"{app.tid}-{app.student_id}", # 프론트엔드에서 사용할 고유 ID
+            "team_id": team.tid,
+            "project_id": team.pid, # 어느 대회의 팀인지
+            "status": app.status, # 항상 0 (대기)
+            "applicant_info": { # 지원자 정보
+                "id": applicant_user.student_id,
+                "student_id": applicant_user.student_id,
+                "name": applicant_user.name,
+                "phone_number": applicant_user.phone_number,
+                "main_language": applicant_user.main_language,
+                "mbti": applicant_user.mbti,
+                "career": applicant_user.career,
+                "gender": applicant_user.gender,
+                "intro": applicant_user.intro
+            }
+        })
     return all_applications_info
 
 
 @app.post("/accept/{tid}/{applicant_student_id}") # applicant_student_id로 명확히
-def accept_team_member(tid: int, applicant_student_id: str, db: Session = Depends(get_db)):
-    team = db.query(Team).filter_by(tid=tid).first()
-    if not team:
+async def accept_team_member(tid: int, applicant_student_id: str, db: AsyncSession = Depends(get_db)):
+    team_status = await get_team_join_status(db, tid, applicant_student_id)
+    if not team_status:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="팀을 찾을 수 없습니다.")
-    if team.completed:
+    if team_status.completed:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 확정된 팀입니다.")
 
-    applicant = db.query(User).filter_by(student_id=applicant_student_id).first()
-    if not applicant:
+    if not team_status.user_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="지원자 정보를 찾을 수 없습니다.")
 
-    application = db.query(Application).filter_by(tid=tid, student_id=applicant_student_id, status=0).first() # 대기중인 신청만
-    if not application:
+    if not team_status.pending_application: # 대기중인 신청만
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 지원자의 대기 중인 신청 내역이 없습니다.")
 
     # 팀 최대 인원수 체크
-    comp = db.query(Competition).filter_by(pid=team.pid).first()
-    current_members_count = db.query(Member).filter_by(tid=tid).count()
-    if current_members_count >= comp.max_members:
+    if team_status.member_count >= team_status.max_members:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="팀 인원이 이미 가득 찼습니다. 수락할 수 없습니다.")
 
-    # 이미 해당 대회(team.pid)의 다른 팀에 멤버로 있는지 확인 (중복 수락 방지)
-    existing_member_in_competition = db.query(Member).join(Team).filter(Team.pid == team.pid, Member.student_id == applicant_student_id).first()
-    if existing_member_in_competition:
+    # 이미 해당 대회의 다른 팀에 멤버로 있는지 확인 (중복 수락 방지)
+    if team_status.existing_tid is not None:
         # 만약 이전에 다른 팀 지원이 거절되었거나, 본인이 탈퇴했다면 수락 가능할 수도 있음.
         # 여기서는 엄격하게, 해당 대회에 어떤 팀이든 멤버로 있으면 중복 수락 불가로 처리.
         # 또는, Application 테이블의 status를 보고, 다른 팀에서 이미 status=1(수락) 상태라면 여기서 막아야 함.
@@ -344,32 +441,42 @@ def accept_team_member(tid: int, applicant_student_id: str, db: Session = Depend
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="해당 지원자는 이미 이 대회의 다른 팀에 소속되어 있습니다.")
 
 
-    db_member = Member(tid=tid, student_id=applicant_student_id)
-    db.add(db_member)
-    application.status = 1  # 1: 수락
-    db.commit()
+    # 대기 상태인 경우에만 수락으로 변경 (조회 이후 동시에 처리된 경우 rowcount 0)
+    result = await db.execute(
+        update(Application)
+        .where(Application.tid == tid, Application.student_id == applicant_student_id, Application.status == 0)
+        .values(status=1) # 1: 수락
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 지원자의 대기 중인 신청 내역이 없습니다.")
+    await bulk_add_members(db, tid, [applicant_student_id])
+    await db.commit()
     return {"message": "팀원 수락 완료"}
 
 
 @app.post("/reject/{tid}/{applicant_student_id}") # POST로 변경 (상태 업데이트) 또는 DELETE 유지 시 의미 명확화
-def reject_team_member(tid: int, applicant_student_id: str, db: Session = Depends(get_db)):
-    application = db.query(Application).filter_by(tid=tid, student_id=applicant_student_id, status=0).first() # 대기중인 신청만
+async def reject_team_member(tid: int, applicant_student_id: str, db: AsyncSession = Depends(get_db)):
+    application = await fetch_one(db, SELECT_PENDING_APPLICATION, {"tid": tid, "sid": applicant_student_id}) # 대기중인 신청만
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 지원자의 대기 중인 신청 내역이 없습니다.")
     application.status = 2  # 2: 거절
-    db.commit()
+    await db.commit()
     return {"message": "팀원 지원 거절 완료"}
 
 # 내가 지원한 신청서 목록 (상태 포함)
 @app.get("/applications/my/{student_id}", response_model=List[dict])
-def get_my_sent_applications(student_id: str, db: Session = Depends(get_db)):
-    apps = db.query(Application).filter_by(student_id=student_id).all()
+async def get_my_sent_applications(student_id: str, db: AsyncSession = Depends(get_db)):
+    # 신청서 + 팀 + 대회 + 팀장을 한 번의 조인 쿼리로 조회
+    rows = (await db.execute(
+        select(Application, Team, Competition, User)
+        .join(Team, Application.tid == Team.tid)
+        .outerjoin(Competition, Team.pid == Competition.pid)
+        .outerjoin(User, Team.leader_id == User.student_id)
+        .where(Application.student_id == student_id)
+        .options(load_only(Competition.title), load_only(User.name), raiseload("*")) # 대회명/팀장 이름만 필요
+    )).all()
     result = []
-    for app in apps:
-        team = db.query(Team).filter_by(tid=app.tid).first()
-        if not team: continue
-        competition = db.query(Competition).filter_by(pid=team.pid).first()
-        leader = db.query(User).filter_by(student_id=team.leader_id).first()
+    for app, team, competition, leader in rows:
         result.append({
             "application_id": f"{app.tid}-{app.student_id}",
             "team_id": app.tid,
@@ -382,32 +489,37 @@ def get_my_sent_applications(student_id: str, db: Session = Depends(get_db)):
 
 
 @app.post("/team/confirm/{tid}") # URL 변경 team/confirm
-def confirm_project_team(tid: int, db: Session = Depends(get_db)): # 함수명 변경
-    team = db.query(Team).filter_by(tid=tid).first()
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="팀을 찾을 수 없습니다.")
-    if team.completed:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 확정된 팀입니다.")
-
-    comp = db.query(Competition).filter_by(pid=team.pid).first()
-    if not comp:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="관련 대회 정보를 찾을 수 없습니다.")
-
-    member_count = db.query(Member).filter_by(tid=tid).count()
-    if member_count < comp.min_members:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"팀 확정을 위해 최소 {comp.min_members}명의 팀원이 필요합니다. (현재 {member_count}명)")
+async def confirm_project_team(tid: int, db: AsyncSession = Depends(get_db)): # 함수명 변경
+    # 검증(미확정 + 최소 인원 충족)과 확정을 UPDATE ... WHERE 한 문장으로 처리
+    min_members = select(Competition.min_members).where(Competition.pid == Team.pid).scalar_subquery()
+    result = await db.execute(
+        update(Team)
+        .where(Team.tid == tid, Team.completed == False, Team.member_count >= min_members)
+        .values(completed=True)
+    )
+    if result.rowcount == 0:
+        # 확정되지 않은 경우에만 실패 원인을 조회
+        team = await fetch_one(db, SELECT_TEAM_BY_ID, {"tid": tid})
+        if not team:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="팀을 찾을 수 없습니다.")
+        if team.completed:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="이미 확정된 팀입니다.")
+        comp = await fetch_one(db, SELECT_COMPETITION_BY_ID, {"pid": team.pid})
+        if not comp:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="관련 대회 정보를 찾을 수 없습니다.")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"팀 확정을 위해 최소 {comp.min_members}명의 팀원이 필요합니다. (현재 {team.member_count}명)")
 
-    team.completed = True
-    db.commit()
     # 팀 확정 시, 해당 팀에 대기 중이던 다른 지원서들은 자동으로 거절 처리 (선택적)
-    db.query(Application).filter(Application.tid == tid, Application.status == 0).update({"status": 2}) # 대기 중인 것들을 거절로
-    db.commit()
+    await db.execute(
+        update(Application).where(Application.tid == tid, Application.status == 0).values(status=2)
+    ) # 대기 중인 것들을 거절로
+    await db.commit()
 
     return {"message": "팀 확정 완료"}
 
 @app.delete("/team/leave/{tid}/{student_id}") # URL 변경 team/leave
-def leave_project_team(tid: int, student_id: str, db: Session = Depends(get_db)): # 함수명 변경
-    team = db.query(Team).filter_by(tid=tid).first()
+async def leave_project_team(tid: int, student_id: str, db: AsyncSession = Depends(get_db)): # 함수명 변경
+    team = await fetch_one(db, SELECT_TEAM_BY_ID, {"tid": tid})
     if not team:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="팀을 찾을 수 없습니다.")
     if team.completed:
@@ -415,31 +527,32 @@ def leave_project_team(tid: int, student_id: str, db: Session = Depends(get_db))
     if team.leader_id == student_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="팀장은 팀을 탈퇴할 수 없습니다. 팀 해체 기능을 이용해주세요.") # 팀 해체 기능은 별도 구현 필요
 
-    member_to_delete = db.query(Member).filter_by(tid=tid, student_id=student_id).first()
+    member_to_delete = await fetch_one(db, SELECT_MEMBER_BY_ID, {"tid": tid, "sid": student_id})
     if not member_to_delete:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="팀 소속 멤버가 아닙니다.")
 
-    db.delete(member_to_delete)
+    await db.delete(member_to_delete)
+    await db.execute(update(Team).where(Team.tid == tid).values(member_count=Team.member_count - 1))
     # 관련된 Application 정보도 삭제 또는 상태 변경 (선택적)
-    # db.query(Application).filter_by(tid=tid, student_id=student_id).delete()
-    db.commit()
+    # await db.execute(delete(Application).where(Application.tid == tid, Application.student_id == student_id))
+    await db.commit()
     return {"message": "팀 탈퇴 완료"}
 
 # 사용자 정보 조회 API (추가 - MemberInfoPopup 등에서 사용)
 @app.get("/users/{student_id}", response_model=dict) # 간단히 dict로 처리, UserOut 스키마 정의 권장
-def get_user_details(student_id: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter_by(student_id=student_id).first()
+async def get_user_details(student_id: str, db: AsyncSession = Depends(get_db)):
+    user = (await db.execute(SELECT_USER_PROFILE, {"sid": student_id})).mappings().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
     return {
-        "id": user.student_id,
-        "student_id": user.student_id,
-        "name": user.name,
-        "phone_number": user.phone_number,
-        "main_language": user.main_language,
-        "mbti": user.mbti,
-        "career": user.career,
-        "gender": user.gender,
-        "intro": user.intro,
-        "isAdmin": user.student_id == "11111111" # 관리자 여부 (임시)
+        "id": user["student_id"],
+        "student_id": user["student_id"],
+        "name": user["name"],
+        "phone_number": user["phone_number"],
+        "main_language": user["main_language"],
+        "mbti": user["mbti"],
+        "career": user["career"],
+        "gender": user["gender"],
+        "intro": user["intro"],
+        "isAdmin": user["is_admin"] # 관리자 여부
     }
@@ -1,18 +1,50 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Date, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, SmallInteger, Boolean, ForeignKey, Date, UniqueConstraint, Index, bindparam, false, select, text
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import deferred, relationship
 from database import Base
 
+# 관리자 학번 (요청사항 기반) - 회원가입/초기화 시 users.is_admin 값으로 반영
+ADMIN_STUDENT_ID = "11111111"
+
+# 학번 최대 길이 - users PK와 이를 참조하는 모든 FK 컬럼에 동일하게 적용
+# (CHAR(n)은 PostgreSQL에서 공백 패딩/비교 규칙이 달라 VARCHAR(n)으로 선언)
+STUDENT_ID_LENGTH = 10
+
+# MBTI 16개 유형 - DB에는 이 튜플의 인덱스(0~15)를 저장
+MBTI_TYPES = tuple(a + b + c + d for a in "EI" for b in "SN" for c in "TF" for d in "JP")
+_MBTI_CODES = {mbti: code for code, mbti in enumerate(MBTI_TYPES)}
+
+class MbtiType(TypeDecorator):
+    """API에서는 "INTJ" 같은 문자열, DB에는 SmallInteger로 저장"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else _MBTI_CODES[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # SQLite의 기존 VARCHAR 컬럼(TEXT affinity)에서는 저장한 코드가 '3'처럼 문자열로 반환됨
+            # 숫자가 아닌 값은 변환 전의 문자열 데이터("INTJ" 등)이므로 그대로 반환
+            if not value.isdigit():
+                return value
+            value = int(value)
+        return MBTI_TYPES[value]
+
 class User(Base):
     __tablename__ = "users"
-    student_id = Column(String, primary_key=True)
-    password = Column(String, nullable=False) 
+    student_id = Column(String(STUDENT_ID_LENGTH), primary_key=True)
+    password = deferred(Column(String, nullable=False)) # 로그인(컬럼 단위 조회) 외에는 로딩하지 않음
     name = Column(String)
     phone_number = Column(String) 
     main_language = Column(String)
-    mbti = Column(String)
+    mbti = Column(MbtiType)
     career = Column(String)
     gender = Column(String)
     intro = Column(String)
+    is_admin = Column(Boolean, nullable=False, server_default=false())
 
 class Competition(Base):
     __tablename__ = "competitions"
@@ -24,26 +56,87 @@ class Competition(Base):
     match_end = Column(Date)
     min_members = Column(Integer)
     max_members = Column(Integer)
+    # 팀 수 캐시 (팀 생성 시 함께 갱신) - 팀 개설 조건 확인 시 COUNT(*) 대신 사용
+    team_count = Column(Integer, nullable=False, server_default=text("0"))
 
 class Participation(Base):
     __tablename__ = "participations"
-    student_id = Column(String, ForeignKey("users.student_id"), primary_key=True)
+    student_id = Column(String(STUDENT_ID_LENGTH), ForeignKey("users.student_id"), primary_key=True)
     pid = Column(Integer, ForeignKey("competitions.pid"), primary_key=True)
 
+    # PK(student_id, pid)는 student_id 선두 조회만 커버하므로 대회별 조회용 인덱스 추가
+    __table_args__ = (
+        Index("ix_participation_pid", "pid"),
+    )
+
 class Team(Base):
     __tablename__ = "teams"
     tid = Column(Integer, primary_key=True, autoincrement=True)
-    leader_id = Column(String, ForeignKey("users.student_id"))
+    leader_id = Column(String(STUDENT_ID_LENGTH), ForeignKey("users.student_id"))
     pid = Column(Integer, ForeignKey("competitions.pid"))
-    completed = Column(Boolean, default=False)
+    # 기존 DB의 teams.completed에는 DB 기본값이 없으므로 INSERT 시 모델 default도 함께 전송
+    completed = Column(Boolean, nullable=False, default=False, server_default=false())
+    # 팀원 수 캐시 (팀원 추가/탈퇴 시 함께 갱신) - 정원/최소 인원 확인 시 COUNT(*) 대신 사용
+    member_count = Column(SmallInteger, nullable=False, server_default=text("0"))
+
+    # 팀장은 대회당 한 팀만 만들 수 있음 - 유니크 인덱스(leader_id 선두)가 팀장별 조회도 커버
+    # (UniqueConstraint 대신 인덱스로 선언 - 기존 테이블에는 create_all이 추가하지 않으므로 database.migrate_db가 생성)
+    __table_args__ = (
+        Index("ix_team_pid", "pid"),
+        Index("uq_team_leader_pid", "leader_id", "pid", unique=True),
+    )
+
+    # 관계는 기본적으로 lazy="raise": 조회 시점에 joinedload/selectinload로 명시적으로 로딩 (N+1 방지)
+    leader = relationship("User", lazy="raise")
+    members = relationship("Member", back_populates="team", lazy="raise")
+    applications = relationship("Application", back_populates="team", lazy="raise")
 
 class Member(Base):
     __tablename__ = "members"
     tid = Column(Integer, ForeignKey("teams.tid"), primary_key=True)
-    student_id = Column(String, ForeignKey("users.student_id"), primary_key=True)
+    student_id = Column(String(STUDENT_ID_LENGTH), ForeignKey("users.student_id"), primary_key=True)
+
+    # PK(tid, student_id)는 tid 선두 조회만 커버하므로 사용자별 소속 팀 조회용 인덱스 추가
+    __table_args__ = (
+        Index("ix_member_sid", "student_id"),
+    )
+
+    team = relationship("Team", back_populates="members", lazy="raise")
+    user = relationship("User", lazy="raise")
 
 class Application(Base):
     __tablename__ = "applications"
     tid = Column(Integer, ForeignKey("teams.tid"), primary_key=True)
-    student_id = Column(String, ForeignKey("users.student_id"), primary_key=True)
-    status = Column(Integer, default=0)  # 0: 대기, 1: 수락, 2: 거절
+    student_id = Column(String(STUDENT_ID_LENGTH), ForeignKey("users.student_id"), primary_key=True)
+    status = Column(SmallInteger, nullable=False, default=0, server_default=text("0"))  # 0: 대기, 1: 수락, 2: 거절 (completed와 같은 이유로 default 병행)
+
+    # 내 신청 목록(student_id) 조회용 + 팀별 대기 신청 조회용 부분 인덱스 (status=0 행만 포함해 작게 유지)
+    __table_args__ = (
+        Index("ix_application_sid_status", "student_id", "status"),
+        Index(
+            "ix_application_pending", "tid", "student_id",
+            sqlite_where=text("status = 0"), postgresql_where=text("status = 0"),
+        ),
+    )
+
+    team = relationship("Team", back_populates="applications", lazy="raise")
+    user = relationship("User", lazy="raise")
+
+# 자주 쓰는 조회 문장을 모듈 로딩 시 한 번만 구성 (값은 bindparam으로 전달 → 엔진의 컴파일 캐시 재사용)
+SELECT_USER_BY_ID = select(User).where(User.student_id == bindparam("sid"))
+SELECT_USER_PROFILE = select(
+    User.student_id, User.name, User.phone_number, User.main_language,
+    User.mbti, User.career, User.gender, User.intro, User.is_admin,
+).where(User.student_id == bindparam("sid"))
+SELECT_USER_CREDENTIALS = SELECT_USER_PROFILE.add_columns(User.password)
+SELECT_COMPETITION_BY_ID = select(Competition).where(Competition.pid == bindparam("pid"))
+# 참가 신청/취소 시 날짜 비교에는 매칭 시작일 컬럼만 필요
+SELECT_COMPETITION_MATCH_START = select(Competition.match_start).where(Competition.pid == bindparam("pid"))
+SELECT_PARTICIPATION_BY_ID = select(Participation).where(
+    Participation.student_id == bindparam("sid"), Participation.pid == bindparam("pid")
+)
+SELECT_TEAM_BY_ID = select(Team).where(Team.tid == bindparam("tid"))
+SELECT_MEMBER_BY_ID = select(Member).where(Member.tid == bindparam("tid"), Member.student_id == bindparam("sid"))
+SELECT_PENDING_APPLICATION = select(Application).where(
+    Application.tid == bindparam("tid"), Application.student_id == bindparam("sid"), Application.status == 0
+)
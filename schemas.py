@@ -1,22 +1,47 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, StringConstraints, TypeAdapter, field_validator
 from datetime import date
+from typing import Annotated, Optional
+from models import MBTI_TYPES, STUDENT_ID_LENGTH
 
-class UserCreate(BaseModel):
-    student_id: str
-    password: str
+# 요청 본문 공통 설정: 정의되지 않은 필드는 거부, 검증 후 변경 불가, 문자열 앞뒤 공백 제거
+# (FastAPI가 본문 파라미터용으로 모델을 다시 감싸므로 defer_build를 쓰지 않고 import 시점에 검증기를 생성)
+REQUEST_CONFIG = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+
+# 학번은 DB 컬럼 길이(VARCHAR(STUDENT_ID_LENGTH))를 넘지 않도록 요청 단계에서 검증
+StudentId = Annotated[str, StringConstraints(min_length=1, max_length=STUDENT_ID_LENGTH)]
+
+# 비밀번호는 입력 그대로 해시/검증 (공백 제거 제외)
+Password = Annotated[str, StringConstraints(strip_whitespace=False)]
+
+class UserLogin(BaseModel):
+    model_config = REQUEST_CONFIG
+    student_id: StudentId
+    password: Password
+
+# 로그인 필드(student_id, password)를 그대로 상속 - 필드 순서도 동일
+class UserCreate(UserLogin):
     name: str
     phone_number: str
     main_language: str
-    mbti: str
+    mbti: Optional[str] = None
     career: str
     gender: str
     intro: str
 
-class UserLogin(BaseModel):
-    student_id: str
-    password: str
+    # DB에는 MBTI를 정수 코드로 저장하므로 16개 유형 중 하나만 허용 (소문자 입력은 대문자로 변환)
+    @field_validator("mbti")
+    @classmethod
+    def check_mbti(cls, v: Optional[str]) -> Optional[str]:
+        # 빈 문자열/미입력은 MBTI 미기재(NULL)로 저장
+        if not v:
+            return None
+        v = v.upper()
+        if v not in MBTI_TYPES:
+            raise ValueError("올바른 MBTI 유형이 아닙니다.")
+        return v
 
 class CompetitionCreate(BaseModel):
+    model_config = REQUEST_CONFIG
     title: str
     host: str
     apply_date: date
@@ -26,6 +51,22 @@ class CompetitionCreate(BaseModel):
     max_members: int
 
 class CompetitionOut(CompetitionCreate):
+    # 응답 모델은 DB 행에서 만들어지므로 추가 컬럼은 무시
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
     pid: int
-    class Config:
-        orm_mode = True
+
+# DB에서 읽은 대회 행을 검증 없이 CompetitionOut으로 변환 (DB 스키마가 이미 타입을 보장하는 내부 경로 전용)
+def to_out(row) -> CompetitionOut:
+    return CompetitionOut.model_construct(
+        pid=row.pid,
+        title=row.title,
+        host=row.host,
+        apply_date=row.apply_date,
+        match_start=row.match_start,
+        match_end=row.match_end,
+        min_members=row.min_members,
+        max_members=row.max_members,
+    )
+
+# 대회 목록 응답용 검증기/직렬화기 (처음 사용할 때 한 번만 생성해 재사용)
+COMPETITIONS_ADAPTER = TypeAdapter(list[CompetitionOut], config=ConfigDict(defer_build=True))
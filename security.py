@@ -0,0 +1,34 @@
+from passlib.context import CryptContext
+import argon2  # noqa: F401 - argon2-cffi가 없으면 첫 로그인 시점이 아니라 시작 시 바로 실패하도록
+import bcrypt  # noqa: F401 - 기존 bcrypt 해시 검증용 (네이티브 bcrypt 모듈이 없으면 느린 대체 구현 대신 바로 실패하도록)
+import os
+import anyio
+
+# 새 비밀번호는 argon2id로 해시, 기존 bcrypt 해시는 검증만 하고 로그인 성공 시 argon2로 교체 (deprecated="auto")
+# argon2 비용은 환경변수로 조정 가능 (메모리는 KiB 단위, 테스트/개발 환경에서는 낮은 값 사용)
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", str(64 * 1024)))
+# 해시 파라미터를 담은 컨텍스트는 프로세스당 하나만 생성해 재사용
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=1,
+)
+
+# 해시/검증은 CPU 작업이므로 워커 스레드에서 실행 (이벤트 루프 블로킹 방지)
+# 반환값: (검증 성공 여부, 교체할 새 해시 또는 None)
+async def verify_and_update_password(plain_password, hashed_password):
+    return await anyio.to_thread.run_sync(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await anyio.to_thread.run_sync(pwd_context.hash, password)
+
+# 두 스킴의 백엔드를 모두 미리 로딩 (bcrypt는 기존 해시 검증에만 쓰이므로 최소 rounds로 한 번만 해시)
+def _warm_up_backends():
+    pwd_context.hash("warmup")
+    pwd_context.handler("bcrypt").using(rounds=4).hash("warmup")
+
+async def warm_up_password_hashing():
+    await anyio.to_thread.run_sync(_warm_up_backends)
@@ -0,0 +1,19 @@
+import os
+import sys
+import tempfile
+
+# main을 import하기 전에 테스트 전용 DB/설정을 지정 (엔진은 import 시점에 생성됨)
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")  # 해시 비용을 낮춰 테스트 속도 확보
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as c:  # lifespan(init_db) 실행
+        yield c
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import main
+from database import get_db, migrate_db
+
+# 초기 버전 모델(create_all)로 만들어진 스키마: completed/status에 DB 기본값이 없음
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (student_id VARCHAR NOT NULL, password VARCHAR NOT NULL, name VARCHAR,
+        phone_number VARCHAR, main_language VARCHAR, mbti VARCHAR, career VARCHAR, gender VARCHAR,
+        intro VARCHAR, PRIMARY KEY (student_id))""",
+    """CREATE TABLE competitions (pid INTEGER NOT NULL, title VARCHAR, host VARCHAR, apply_date DATE,
+        match_start DATE, match_end DATE, min_members INTEGER, max_members INTEGER, PRIMARY KEY (pid))""",
+    """CREATE TABLE participations (student_id VARCHAR NOT NULL, pid INTEGER NOT NULL,
+        PRIMARY KEY (student_id, pid), FOREIGN KEY(student_id) REFERENCES users (student_id),
+        FOREIGN KEY(pid) REFERENCES competitions (pid))""",
+    """CREATE TABLE teams (tid INTEGER NOT NULL, leader_id VARCHAR, pid INTEGER, completed BOOLEAN,
+        PRIMARY KEY (tid), FOREIGN KEY(leader_id) REFERENCES users (student_id),
+        FOREIGN KEY(pid) REFERENCES competitions (pid))""",
+    """CREATE TABLE members (tid INTEGER NOT NULL, student_id VARCHAR NOT NULL, PRIMARY KEY (tid, student_id),
+        FOREIGN KEY(tid) REFERENCES teams (tid), FOREIGN KEY(student_id) REFERENCES users (student_id))""",
+    """CREATE TABLE applications (tid INTEGER NOT NULL, student_id VARCHAR NOT NULL, status INTEGER,
+        PRIMARY KEY (tid, student_id), FOREIGN KEY(tid) REFERENCES teams (tid),
+        FOREIGN KEY(student_id) REFERENCES users (student_id))""",
+]
+
+def _signup(client, student_id):
+    user = dict(student_id=student_id, password="pw", name=f"u{student_id}", phone_number="010",
+                main_language="python", mbti="ENFP", career="", gender="F", intro="")
+    assert client.post("/signup", json=user).status_code == 200
+
+async def _create_baseline(engine):
+    async with engine.begin() as conn:
+        for ddl in BASELINE_SCHEMA:
+            await conn.execute(text(ddl))
+        # 마이그레이션 전에 completed가 NULL로 남은 기존 팀
+        await conn.execute(text("INSERT INTO users (student_id, password) VALUES ('2019000000', 'x')"))
+        await conn.execute(text("INSERT INTO competitions (pid, min_members, max_members) VALUES (1, 1, 2)"))
+        await conn.execute(text("INSERT INTO teams (tid, leader_id, pid, completed) VALUES (1, '2019000000', 1, NULL)"))
+    await migrate_db(engine)
+
+async def _null_counts(engine):
+    async with engine.connect() as conn:
+        teams = await conn.scalar(text("SELECT count(*) FROM teams WHERE completed IS NULL"))
+        applications = await conn.scalar(text("SELECT count(*) FROM applications WHERE status IS NULL"))
+    return teams, applications
+
+# 기존(초기 스키마) DB를 migrate_db로 옮긴 뒤 지원 → 수락 → 확정 흐름이 동작해야 함
+def test_baseline_db_migration(client):
+    path = os.path.join(tempfile.mkdtemp(), "baseline.db")
+    # 테스트 클라이언트의 이벤트 루프와 커넥션을 공유하지 않도록 NullPool 사용
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    asyncio.run(_create_baseline(engine))
+
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async def override_get_db():
+        async with sessions() as db:
+            yield db
+    main.app.dependency_overrides[get_db] = override_get_db
+    try:
+        start = date.today() + timedelta(days=10)
+        comp = dict(title="대회", host="주최", apply_date=str(date.today()), match_start=str(start),
+                    match_end=str(start + timedelta(days=5)), min_members=2, max_members=3)
+        pid = client.post("/competitions", json=comp).json()["pid"]
+        leader, applicant = "2024100001", "2024100002"
+        for sid in (leader, applicant):
+            _signup(client, sid)
+            assert client.post(f"/participate/{sid}/{pid}").status_code == 200
+
+        tid = client.post(f"/team/create/{leader}/{pid}").json()["team_id"]
+        assert client.post(f"/apply/{applicant}/{tid}").status_code == 200
+        applications = client.get(f"/team/applications/{leader}").json()
+        assert [a["applicant_info"]["student_id"] for a in applications] == [applicant]
+        assert client.post(f"/accept/{tid}/{applicant}").status_code == 200
+        teams = client.get(f"/teams/{pid}").json()
+        assert teams[0]["is_complete"] is False
+        assert client.post(f"/team/confirm/{tid}").status_code == 200
+    finally:
+        main.app.dependency_overrides.pop(get_db, None)
+
+    assert asyncio.run(_null_counts(engine)) == (0, 0)
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from database import engine
+
+TEAM_COUNT = 6
+
+def _signup(client, student_id):
+    user = dict(student_id=student_id, password="pw", name=f"u{student_id}", phone_number="010",
+                main_language="python", mbti="INTJ", career="", gender="M", intro="")
+    assert client.post("/signup", json=user).status_code == 200
+
+# 팀 목록 조회는 팀 수와 무관하게 쿼리 3개 이하 (N+1 회귀 방지)
+def test_list_teams_query_count(client):
+    start = date.today() + timedelta(days=10)
+    comp = dict(title="대회", host="주최", apply_date=str(date.today()), match_start=str(start),
+                match_end=str(start + timedelta(days=5)), min_members=2, max_members=3)
+    pid = client.post("/competitions", json=comp).json()["pid"]
+
+    # 팀마다 팀장 1명 + 수락된 팀원 1명
+    for i in range(TEAM_COUNT * 2):
+        _signup(client, f"2024{i:04d}")
+        assert client.post(f"/participate/2024{i:04d}/{pid}").status_code == 200
+    for i in range(TEAM_COUNT):
+        leader, member = f"2024{i:04d}", f"2024{i + TEAM_COUNT:04d}"
+        tid = client.post(f"/team/create/{leader}/{pid}").json()["team_id"]
+        assert client.post(f"/apply/{member}/{tid}").status_code == 200
+        assert client.post(f"/accept/{tid}/{member}").status_code == 200
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = client.get(f"/teams/{pid}")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    teams = response.json()
+    assert len(teams) == TEAM_COUNT
+    assert all(len(team["members"]) == 2 for team in teams)
+    assert len(statements) <= 3, statements